@@ -4,10 +4,75 @@ Quick MBox Platform Scan - Fast and Safe Analysis
 """
 
 import os
+from collections import Counter, defaultdict
+from fnmatch import fnmatch
 from pathlib import Path
 from datetime import datetime
 import json
 
+# Build output and tooling directories that are not walked
+IGNORE_DIRS = {'.git', '.vs', 'bin', 'obj', 'node_modules', 'packages'}
+
+def count_cs_files(dirpath: str) -> int:
+    """Count the entries directly inside a directory that glob('*.cs') matches; 0 if unreadable."""
+    try:
+        with os.scandir(dirpath) as it:
+            return sum(1 for entry in it if entry.name.endswith('.cs'))
+    except OSError:
+        return 0
+
+def walk_project(root: Path, extensions, key_patterns, max_key_files: int = 10):
+    """Count files by extension, collect key files and tally C# files per src subdirectory in one walk."""
+    counts = Counter()
+    key_files = {pattern: [] for pattern in key_patterns}
+    src_counts = defaultdict(int)
+    src_path = os.path.join(root, 'src')
+    src_walked = False
+    
+    def visit(dirpath: str):
+        nonlocal src_walked
+        subdirs = []
+        in_src = dirpath == src_path
+        src_walked = src_walked or in_src
+        # Same top-down order as os.walk, but the DirEntry keeps the stat
+        # result so key file sizes need no extra stat() call
+        try:
+            with os.scandir(dirpath) as it:
+                for entry in it:
+                    if entry.is_dir():
+                        if entry.name not in IGNORE_DIRS and not entry.is_symlink():
+                            subdirs.append(entry.path)
+                        elif in_src:
+                            # The walk skips this src/<name>, but it is still reported
+                            src_counts[entry.name] = count_cs_files(entry.path)
+                        continue
+                    ext = os.path.splitext(entry.name)[1]
+                    if ext in extensions:
+                        counts[ext] += 1
+                    if ext == '.cs' and os.path.dirname(dirpath) == src_path:
+                        src_counts[os.path.basename(dirpath)] += 1
+                    for pattern in key_patterns:
+                        if len(key_files[pattern]) < max_key_files and fnmatch(entry.name, pattern):
+                            try:
+                                size = entry.stat().st_size
+                            except OSError:
+                                # A dangling symlink or a file removed mid-walk; skip just this entry
+                                continue
+                            key_files[pattern].append((entry.path, size))
+        except OSError:
+            return
+        for subdir in subdirs:
+            visit(subdir)
+    
+    visit(str(root))
+    # A symlinked src is not walked either; count its subdirectories directly
+    if not src_walked and os.path.isdir(src_path):
+        with os.scandir(src_path) as it:
+            for entry in it:
+                if entry.is_dir():
+                    src_counts[entry.name] = count_cs_files(entry.path)
+    return counts, key_files, src_counts
+
 def quick_scan():
     """Perform a quick, safe scan of the MBox platform."""
     mbox_path = Path("/mnt/d/dev2/mbox-platform")
@@ -27,19 +92,6 @@ def quick_scan():
     print("Quick MBox Platform Scan")
     print("=" * 30)
     
-    # Scan src directory structure
-    src_path = mbox_path / "src"
-    if src_path.exists():
-        print(f"Scanning src directory...")
-        for item in src_path.iterdir():
-            if item.is_dir():
-                file_count = len(list(item.glob("*.cs")))
-                results['src_directories'][item.name] = {
-                    'cs_files': file_count,
-                    'path': str(item.relative_to(mbox_path))
-                }
-                print(f"  {item.name}: {file_count} C# files")
-    
     # Look for key configuration files
     key_patterns = [
         "appsettings*.json",
@@ -47,22 +99,39 @@ def quick_scan():
         "*.csproj"
     ]
     
+    extensions = ['.cs', '.sql', '.json', '.cshtml']
+    
+    # One walk gathers the src layout, the key files and the per-extension counts
+    counts, key_files, src_counts = walk_project(mbox_path, extensions, key_patterns)
+    
+    # Scan src directory structure
+    src_path = mbox_path / "src"
+    if src_path.exists():
+        print(f"Scanning src directory...")
+        with os.scandir(src_path) as it:
+            for entry in it:
+                if entry.is_dir():
+                    file_count = src_counts[entry.name]
+                    results['src_directories'][entry.name] = {
+                        'cs_files': file_count,
+                        'path': os.path.join('src', entry.name)
+                    }
+                    print(f"  {entry.name}: {file_count} C# files")
+    
     print(f"\nScanning for key files...")
     for pattern in key_patterns:
-        files = list(mbox_path.glob(f"**/{pattern}"))[:10]  # Limit results
-        for file in files:
-            rel_path = str(file.relative_to(mbox_path))
+        for file, size in key_files[pattern]:
+            rel_path = os.path.relpath(file, mbox_path)
             results['key_files'].append({
                 'file': rel_path,
                 'type': pattern,
-                'size': file.stat().st_size
+                'size': size
             })
             print(f"  Found: {rel_path}")
     
-    # File type counts (top level only for speed)
-    extensions = ['.cs', '.sql', '.json', '.cshtml']
+    # File type counts
     for ext in extensions:
-        count = len(list(mbox_path.glob(f"**/*{ext}")))
+        count = counts[ext]
         results['file_counts'][ext] = count
         print(f"  {ext} files: {count}")
     
@@ -7,16 +7,234 @@ Analyzes C# files for SQL patterns and Entity Framework usage.
 import os
 import re
 import json
+import mmap
+import sys
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Any
+from itertools import islice
+from typing import Dict, Any, Iterator, Optional, Tuple, Union
+
+# Faster JSON encoding when available
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Findings are stored column-wise: one sequence per field instead of one dict per match
+Columns = Dict[str, Any]
+COLUMNS = ('file', 'line', 'type', 'pattern', 'text', 'context', 'confidence')
+
+# Files are scanned in windows of about this many bytes, cut at line ends.
+# No pattern can match across a newline, so windows need no overlap.
+WINDOW_SIZE = 1 << 20
+
+# Rows per INSERT statement in the SQL output
+SQL_INSERT_BATCH_SIZE = 1000
+
+def new_columns() -> Columns:
+    """Create an empty column store for findings."""
+    return {
+        'file': [],
+        'line': array('i'),
+        'type': [],
+        'pattern': [],
+        'text': [],
+        'context': [],
+        'confidence': array('B')
+    }
+
+def extend_columns(cols: Columns, other: Columns):
+    """Append another column store, interning the repeated label strings."""
+    for name in COLUMNS:
+        if name in ('file', 'type', 'pattern'):
+            cols[name].extend(map(sys.intern, other[name]))
+        else:
+            cols[name].extend(other[name])
+
+def iter_findings(cols: Columns) -> Iterator[Dict[str, Any]]:
+    """Yield findings as row dicts, built lazily from the columns."""
+    for row in zip(*(cols[name] for name in COLUMNS)):
+        yield dict(zip(COLUMNS, row))
+
+def _pattern_tokens(pattern: str) -> Iterator[Tuple[str, str]]:
+    """Split a regex source into ('escape' | 'class' | 'literal', text) tokens."""
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == '\\':
+            yield 'escape', pattern[i:i + 2]
+            i += 2
+        elif c == '[':
+            j = i + 1
+            if j < n and pattern[j] == '^':
+                j += 1
+            if j < n and pattern[j] == ']':
+                j += 1
+            while j < n and pattern[j] != ']':
+                j += 2 if pattern[j] == '\\' else 1
+            yield 'class', pattern[i:j + 1]
+            i = j + 1
+        else:
+            yield 'literal', c
+            i += 1
+
+# Escapes that name a character by code, which may be upper case
+_CODE_ESCAPES = frozenset('xuUN0')
+
+def _fold_case(pattern: str) -> Optional[str]:
+    """Lowercase a pattern's literal characters for a lowercased buffer.
+
+    Escapes (\\S, \\W, \\A, ...) are kept as they are. Returns None when the
+    pattern cannot be folded safely: a class holding upper-case letters, or a
+    character given by code.
+    """
+    parts = []
+    for kind, text in _pattern_tokens(pattern):
+        if kind == 'literal':
+            parts.append(text.lower())
+            continue
+        if kind == 'escape':
+            if text[1:] in _CODE_ESCAPES:
+                return None
+        else:
+            for item in re.findall(r'\\.|.', text, re.DOTALL):
+                if (item[1:] in _CODE_ESCAPES) if len(item) == 2 else item.isupper():
+                    return None
+        parts.append(text)
+    return ''.join(parts)
+
+def _single_line(pattern: str) -> str:
+    """Keep whitespace classes from crossing newlines.
+
+    Matches used to be confined to one line because every line was scanned on
+    its own; the whole file is now scanned in a single pass.
+    """
+    parts = []
+    for kind, text in _pattern_tokens(pattern):
+        if kind == 'escape' and text == r'\s':
+            text = r'[^\S\n]'
+        elif kind == 'class' and not text.startswith('[^'):
+            # Inside a class, spell out the (bytes) whitespace set without \n;
+            # a negated class with \s already excludes newlines
+            text = re.sub(r'\\.', lambda m: r' \t\r\f\v' if m.group() == r'\s' else m.group(), text)
+        parts.append(text)
+    return ''.join(parts)
+
+def iter_cs_files(root: str) -> Iterator[str]:
+    """Yield the paths of all .cs files under root, like Path.rglob('*.cs').
+
+    Walks with os.scandir so directory checks use the cached entry type and no
+    Path objects are built; symlinked directories are not followed.
+    """
+    stack = [root]
+    while stack:
+        subdirs = []
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.name.endswith('.cs'):
+                        yield entry.path
+        except OSError:
+            pass
+        # Pushed in reverse so they pop in listing order: a directory's files,
+        # then each subdirectory's whole subtree in turn, the order rglob uses
+        stack.extend(reversed(subdirs))
+
+def _required_literals(pattern: str) -> Optional[Tuple[bytes, ...]]:
+    """Lower-case literals at least one of which every match of pattern contains.
+
+    Each top-level alternative contributes its longest run of plain word
+    characters. Patterns with groups or classes return None (no screen).
+    """
+    if re.search(r'(?<!\\)[()\[\]]', pattern):
+        return None
+    literals = []
+    for alternative in re.split(r'(?<!\\)\|', pattern):
+        # Escapes are never plain literals, and optional characters may be absent
+        plain = re.sub(r'\\.', ' ', alternative)
+        plain = re.sub(r'.(?:[?*]|\{[^}]*\})', ' ', plain)
+        runs = re.findall(r'\w+', plain)
+        if not runs:
+            return None
+        literals.append(max(runs, key=len).lower().encode())
+    return tuple(literals)
+
+def _category_literals(patterns: Dict[str, str]) -> Optional[Tuple[bytes, ...]]:
+    """Literals screening a whole category, or None if any pattern cannot be screened."""
+    literals = set()
+    for pattern in patterns.values():
+        required = _required_literals(pattern)
+        if required is None:
+            return None
+        literals.update(required)
+    # A literal containing another one is implied by it
+    return tuple(sorted(literal for literal in literals
+                        if not any(other != literal and other in literal for other in literals)))
+
+def _compile(pattern: str) -> re.Pattern:
+    """Compile a pattern for matching against a lowercased file buffer.
+
+    Literal characters are lowercased rather than compiling with re.IGNORECASE,
+    which keeps literal prefixes fast; patterns that cannot be folded safely
+    fall back to re.IGNORECASE.
+    """
+    folded = _fold_case(pattern)
+    if folded is not None:
+        try:
+            return re.compile(_single_line(folded).encode())
+        except re.error:
+            # e.g. an inline flag group such as (?L) that only exists in upper case
+            pass
+    return re.compile(_single_line(pattern).encode(), re.IGNORECASE)
+
+_NEWLINE = re.compile(b'\n')
+
+def _newline_index(buf: bytes) -> array:
+    """Byte offsets of every newline in a buffer, in ascending order."""
+    return array('q', [match.start() for match in _NEWLINE.finditer(buf)])
+
+def _windows(buf: mmap.mmap, size: int = WINDOW_SIZE) -> Iterator[Tuple[int, int]]:
+    """Split a buffer into (start, end) windows of about size bytes, each ending after a newline."""
+    start, length = 0, len(buf)
+    while start < length:
+        end = length
+        if start + size < length:
+            # Extend to the end of the line so no match is cut in two
+            newline = buf.find(b'\n', start + size - 1)
+            if newline >= 0:
+                end = newline + 1
+        yield start, end
+        start = end
+
+def _json_dumps(value: Any) -> str:
+    """Serialize one value to compact JSON, with orjson when installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value).decode('utf-8')
+    return json.dumps(value)
+
+def _sql_str(value: str) -> str:
+    """Escape a value for use inside a single-quoted T-SQL literal."""
+    return value.replace("'", "''")
+
+def _decode(data: bytes) -> str:
+    """Decode matched bytes, dropping invalid UTF-8 as the text reader did."""
+    return data.decode('utf-8', errors='ignore')
 
 class QuickSQLAnalyzer:
     """Quick analyzer for SQL patterns in C# code."""
     
     def __init__(self):
         self.sql_patterns = {
-            'SELECT': r'SELECT\s+.*?\s+FROM\s+\w+',
+            # Single whitespace on both sides of the lazy run keeps this linear;
+            # '\s+.*?\s+' backtracks quadratically on long whitespace runs
+            'SELECT': r'SELECT\s.*?\sFROM\s+\w+',
             'INSERT': r'INSERT\s+INTO\s+\w+',
             'UPDATE': r'UPDATE\s+\w+\s+SET',
             'DELETE': r'DELETE\s+FROM\s+\w+',
@@ -45,90 +263,188 @@ class QuickSQLAnalyzer:
             'ConnectionString': r'ConnectionString\s*=|connectionString'
         }
         
-        self.results = []
+        # Flat (category, pattern name, confidence, regex) table. Each pattern
+        # keeps its literal prefix, which the regex engine skips ahead to far
+        # faster than it can try a union of alternatives at every position.
+        self._patterns = [
+            (category, name, confidence, _compile(pattern))
+            for category, patterns, confidence in (
+                ('SQL', self.sql_patterns, 90),
+                ('EntityFramework', self.ef_patterns, 95),
+                ('ADO.NET', self.ado_patterns, 85)
+            )
+            for name, pattern in patterns.items()
+        ]
         
-    def analyze_file(self, file_path: Path) -> List[Dict[str, Any]]:
-        """Analyze a single C# file for SQL patterns."""
-        findings = []
+        # Literal screen per category, derived from the patterns so customised
+        # pattern dicts are still matched; None means the category always runs
+        self._category_literals = {
+            category: _category_literals(patterns)
+            for category, patterns in (
+                ('SQL', self.sql_patterns),
+                ('EntityFramework', self.ef_patterns),
+                ('ADO.NET', self.ado_patterns)
+            )
+        }
         
+        self.cols = new_columns()
+        
+    def analyze_file(self, file_path: Union[str, Path]) -> Columns:
+        """Analyze a single C# file for SQL patterns."""
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-                lines = content.split('\n')
-                
-            # Analyze each line
-            for line_num, line in enumerate(lines, 1):
-                # Check SQL patterns
-                for pattern_name, pattern in self.sql_patterns.items():
-                    matches = re.finditer(pattern, line, re.IGNORECASE)
-                    for match in matches:
-                        findings.append({
-                            'file': str(file_path),
-                            'line': line_num,
-                            'type': 'SQL',
-                            'pattern': pattern_name,
-                            'text': match.group(),
-                            'context': line.strip(),
-                            'confidence': 90
-                        })
-                
-                # Check Entity Framework patterns
-                for pattern_name, pattern in self.ef_patterns.items():
-                    matches = re.finditer(pattern, line, re.IGNORECASE)
-                    for match in matches:
-                        findings.append({
-                            'file': str(file_path),
-                            'line': line_num,
-                            'type': 'EntityFramework',
-                            'pattern': pattern_name,
-                            'text': match.group(),
-                            'context': line.strip(),
-                            'confidence': 95
-                        })
-                
-                # Check ADO.NET patterns
-                for pattern_name, pattern in self.ado_patterns.items():
-                    matches = re.finditer(pattern, line, re.IGNORECASE)
-                    for match in matches:
-                        findings.append({
-                            'file': str(file_path),
-                            'line': line_num,
-                            'type': 'ADO.NET',
-                            'pattern': pattern_name,
-                            'text': match.group(),
-                            'context': line.strip(),
-                            'confidence': 85
-                        })
+            # Scan the mapped bytes directly instead of decoding a full copy
+            with open(file_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return new_columns()
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return self._scan(mm, str(file_path))
                         
         except Exception as e:
             print(f"Error analyzing {file_path}: {e}")
+            return new_columns()
+    
+    def _scan(self, buf: mmap.mmap, file_name: str) -> Columns:
+        """Run every pattern category over a file's bytes, one window at a time."""
+        cols = new_columns()
+        file_name = sys.intern(file_name)
+        
+        # Per-pattern (lines, texts, contexts), collected across all windows
+        hits = [([], [], []) for _ in self._patterns]
+        line_base = 0
+        
+        for window_start, window_end in _windows(buf):
+            chunk = buf[window_start:window_end]
+            line_base += self._scan_window(chunk, line_base, hits)
+        
+        # Emit in line order, then pattern order, as the line-by-line scan did;
+        # each pattern's hits are already in line order
+        order = sorted((line, index, position)
+                       for index, (lines, _, _) in enumerate(hits)
+                       for position, line in enumerate(lines))
+        for line, index, position in order:
+            category, pattern_name, confidence, _ = self._patterns[index]
+            _, texts, contexts = hits[index]
+            cols['file'].append(file_name)
+            cols['line'].append(line)
+            cols['type'].append(category)
+            cols['pattern'].append(pattern_name)
+            cols['text'].append(texts[position])
+            cols['context'].append(contexts[position])
+            cols['confidence'].append(confidence)
+                
+        return cols
+    
+    def _scan_window(self, chunk: bytes, line_base: int, hits: list) -> int:
+        """Match every pattern in one line-aligned window; returns its newline count."""
+        # Fold case once (ASCII only, like re.IGNORECASE on bytes); reported
+        # text and context are still sliced from the original bytes
+        lowered = chunk.lower()
+        
+        # Cheap literal screen before any regex runs; most files have no SQL at all
+        active = {category for category, literals in self._category_literals.items()
+                  if literals is None or any(literal in lowered for literal in literals)}
+        if not active:
+            return lowered.count(b'\n')
+        
+        # Newline offsets are only indexed once a window turns out to have matches;
+        # line numbers then come from a bisect and context lines from the index
+        newlines: Optional[array] = None
+        
+        # Several patterns often hit the same line; decode its context once
+        contexts: Dict[int, str] = {}
+        
+        def context_of(line_index: int) -> str:
+            context = contexts.get(line_index)
+            if context is None:
+                line_start = newlines[line_index - 1] + 1 if line_index else 0
+                line_end = newlines[line_index] if line_index < len(newlines) else len(chunk)
+                context = contexts[line_index] = _decode(chunk[line_start:line_end]).strip()
+            return context
+        
+        # Gather each pattern's spans first, then fill its hit lists a whole
+        # batch at a time rather than one field per match
+        for (category, _, _, regex), (lines, texts, line_contexts) in zip(self._patterns, hits):
+            if category not in active:
+                continue
+            spans = [match.span() for match in regex.finditer(lowered)]
+            if not spans:
+                continue
+            if newlines is None:
+                newlines = _newline_index(lowered)
+            line_indexes = [bisect_right(newlines, start) for start, _ in spans]
             
-        return findings
+            lines.extend([line_base + line_index + 1 for line_index in line_indexes])
+            texts.extend([_decode(chunk[start:end]) for start, end in spans])
+            line_contexts.extend([context_of(line_index) for line_index in line_indexes])
+        
+        return len(newlines) if newlines is not None else lowered.count(b'\n')
     
-    def analyze_directory(self, directory: str) -> List[Dict[str, Any]]:
-        """Analyze all C# files in a directory."""
-        dir_path = Path(directory)
-        all_findings = []
+    def analyze_directory(self, directory: str, max_workers: Optional[int] = None) -> Columns:
+        """Analyze all C# files in a directory, one worker process per core by default."""
+        self.cols = new_columns()
         
         # Find all C# files
-        cs_files = list(dir_path.rglob('*.cs'))
+        cs_files = list(iter_cs_files(str(Path(directory))))
         
         print(f"Found {len(cs_files)} C# files to analyze")
         
-        for cs_file in cs_files:
-            print(f"Analyzing: {cs_file}")
-            findings = self.analyze_file(cs_file)
-            all_findings.extend(findings)
+        if max_workers == 1:
+            for cs_file in cs_files:
+                print(f"Analyzing: {cs_file}")
+                extend_columns(self.cols, self.analyze_file(cs_file))
+            return self.cols
+        
+        # Files are independent, so scan them in parallel; each worker gets its
+        # own copy of this analyzer and compiles the patterns once
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(self,)) as executor:
+            results = executor.map(_analyze_file_worker, cs_files, chunksize=32)
+            for cs_file, findings in zip(cs_files, results):
+                print(f"Analyzed: {cs_file}")
+                extend_columns(self.cols, findings)
             
-        return all_findings
+        return self.cols
     
-    def generate_sql_output(self, findings: List[Dict[str, Any]], output_file: str):
-        """Generate SQL-style output from findings."""
+    def generate_sql_output(self, findings: Columns, output_file: str, counts: Optional[Counter] = None):
+        """Generate SQL-style output from findings, reusing precomputed type counts if given."""
+        total = len(findings['line'])
+        if counts is None:
+            counts = Counter(findings['type'])
         
         with open(output_file, 'w', encoding='utf-8') as f:
             f.write("-- SQL Server Code Analysis Results\n")
             f.write(f"-- Generated: {datetime.now().isoformat()}\n")
-            f.write(f"-- Total findings: {len(findings)}\n\n")
+            f.write(f"-- Total findings: {total}\n\n")
+            
+            f.write("-- Analysis Results Table\n")
+            f.write("IF OBJECT_ID('vw_MBoxAnalysisResults', 'V') IS NOT NULL DROP VIEW vw_MBoxAnalysisResults\n")
+            f.write("IF OBJECT_ID('MBoxAnalysisResults', 'U') IS NOT NULL DROP TABLE MBoxAnalysisResults\n")
+            f.write("CREATE TABLE MBoxAnalysisResults (\n")
+            f.write("    FilePath NVARCHAR(MAX),\n")
+            f.write("    LineNumber INT,\n")
+            f.write("    PatternType NVARCHAR(50),\n")
+            f.write("    PatternName NVARCHAR(200),\n")
+            f.write("    MatchedText NVARCHAR(MAX),\n")
+            f.write("    ContextLine NVARCHAR(MAX),\n")
+            f.write("    Confidence INT\n")
+            f.write(")\nGO\n\n")
+            
+            # Stream rows straight from the columns; truncate before escaping so
+            # a doubled quote is never cut in half
+            rows = ("    ('%s', %d, '%s', '%s', '%s...', '%s...', %d)" % (
+                        _sql_str(path), line, pattern_type, _sql_str(pattern),
+                        _sql_str(text[:50]), _sql_str(context[:100]), confidence)
+                    for path, line, pattern_type, pattern, text, context, confidence
+                    in zip(*(findings[name] for name in COLUMNS)))
+            
+            # SQL Server caps a VALUES list at 1000 rows per INSERT, and each
+            # GO keeps the batches small enough to parse independently
+            for _ in range(0, total, SQL_INSERT_BATCH_SIZE):
+                f.write("INSERT INTO MBoxAnalysisResults "
+                        "(FilePath, LineNumber, PatternType, PatternName, MatchedText, ContextLine, Confidence)\n")
+                f.write("VALUES\n")
+                f.writelines(_separated(islice(rows, SQL_INSERT_BATCH_SIZE), ",\n"))
+                f.write("\nGO\n\n")
             
             f.write("-- Analysis Results View\n")
             f.write("CREATE VIEW vw_MBoxAnalysisResults AS\n")
@@ -140,41 +456,58 @@ class QuickSQLAnalyzer:
             f.write("    MatchedText,\n")
             f.write("    ContextLine,\n")
             f.write("    Confidence\n")
-            f.write("FROM (\n")
-            f.write("    VALUES \n")
-            
-            for i, finding in enumerate(findings):
-                comma = "," if i < len(findings) - 1 else ""
-                f.write(f"        ('{finding['file']}', {finding['line']}, '{finding['type']}', '{finding['pattern']}', '{finding['text'][:50]}...', '{finding['context'][:100]}...', {finding['confidence']}){comma}\n")
-            
-            f.write(") AS Analysis(FilePath, LineNumber, PatternType, PatternName, MatchedText, ContextLine, Confidence)\n\n")
+            f.write("FROM MBoxAnalysisResults\n")
+            f.write("GO\n\n")
             
             # Add summary statistics
             f.write("-- Summary Statistics\n")
-            sql_count = len([f for f in findings if f['type'] == 'SQL'])
-            ef_count = len([f for f in findings if f['type'] == 'EntityFramework'])
-            ado_count = len([f for f in findings if f['type'] == 'ADO.NET'])
-            
-            f.write(f"-- SQL Statements: {sql_count}\n")
-            f.write(f"-- Entity Framework: {ef_count}\n")
-            f.write(f"-- ADO.NET: {ado_count}\n")
-            f.write(f"-- Total: {len(findings)}\n")
+            f.write(f"-- SQL Statements: {counts['SQL']}\n")
+            f.write(f"-- Entity Framework: {counts['EntityFramework']}\n")
+            f.write(f"-- ADO.NET: {counts['ADO.NET']}\n")
+            f.write(f"-- Total: {total}\n")
             
-    def generate_json_output(self, findings: List[Dict[str, Any]], output_file: str):
-        """Generate JSON output from findings."""
-        output_data = {
+    def generate_json_output(self, findings: Columns, output_file: str, counts: Optional[Counter] = None):
+        """Generate JSON output from findings, reusing precomputed type counts if given."""
+        total = len(findings['line'])
+        if counts is None:
+            counts = Counter(findings['type'])
+        header = {
             'analysis_timestamp': datetime.now().isoformat(),
-            'total_findings': len(findings),
+            'total_findings': total,
             'summary': {
-                'sql_statements': len([f for f in findings if f['type'] == 'SQL']),
-                'entity_framework': len([f for f in findings if f['type'] == 'EntityFramework']),
-                'ado_net': len([f for f in findings if f['type'] == 'ADO.NET'])
-            },
-            'findings': findings
+                'sql_statements': counts['SQL'],
+                'entity_framework': counts['EntityFramework'],
+                'ado_net': counts['ADO.NET']
+            }
         }
         
+        # Write the envelope by hand and stream one compact finding per line,
+        # so the whole document is never built in memory
         with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, indent=2)
+            f.write("{\n")
+            for key, value in header.items():
+                f.write(f"  {_json_dumps(key)}: {_json_dumps(value)},\n")
+            f.write('  "findings": [\n')
+            f.writelines(_separated(("    " + _json_dumps(finding) for finding in iter_findings(findings)), ",\n"))
+            if total:
+                f.write("\n")
+            f.write("  ]\n}\n")
+
+def _separated(rows: Iterator[str], separator: str) -> Iterator[str]:
+    """Yield rows with a separator between them, for file.writelines."""
+    for i, row in enumerate(rows):
+        yield row if i == 0 else separator + row
+
+_worker_analyzer: Optional[QuickSQLAnalyzer] = None
+
+def _init_worker(analyzer: QuickSQLAnalyzer):
+    """Install the analyzer used by this worker process."""
+    global _worker_analyzer
+    _worker_analyzer = analyzer
+
+def _analyze_file_worker(file_path: str) -> Columns:
+    """Process pool entry point for QuickSQLAnalyzer.analyze_file."""
+    return _worker_analyzer.analyze_file(file_path)
 
 def main():
     """Main execution function."""
@@ -184,28 +517,32 @@ def main():
     parser.add_argument('--directory', '-d', required=True, help='Directory to analyze')
     parser.add_argument('--output', '-o', required=True, help='Output file path')
     parser.add_argument('--format', choices=['sql', 'json'], default='sql', help='Output format')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count, 1 disables)')
     
     args = parser.parse_args()
     
     # Run analysis
     analyzer = QuickSQLAnalyzer()
-    findings = analyzer.analyze_directory(args.directory)
+    findings = analyzer.analyze_directory(args.directory, args.workers)
+    
+    # Count finding types once for the console summary and the output file
+    counts = Counter(findings['type'])
     
     print(f"\nAnalysis complete!")
-    print(f"Total findings: {len(findings)}")
-    print(f"SQL statements: {len([f for f in findings if f['type'] == 'SQL'])}")
-    print(f"Entity Framework: {len([f for f in findings if f['type'] == 'EntityFramework'])}")
-    print(f"ADO.NET: {len([f for f in findings if f['type'] == 'ADO.NET'])}")
+    print(f"Total findings: {len(findings['line'])}")
+    print(f"SQL statements: {counts['SQL']}")
+    print(f"Entity Framework: {counts['EntityFramework']}")
+    print(f"ADO.NET: {counts['ADO.NET']}")
     
     # Generate output
     if args.format == 'json':
-        analyzer.generate_json_output(findings, args.output)
+        analyzer.generate_json_output(findings, args.output, counts)
     else:
-        analyzer.generate_sql_output(findings, args.output)
+        analyzer.generate_sql_output(findings, args.output, counts)
         
     print(f"Results written to: {args.output}")
     
-    return len(findings)
+    return len(findings['line'])
 
 if __name__ == "__main__":
     exit_code = main()
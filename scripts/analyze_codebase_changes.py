@@ -11,14 +11,33 @@ import json
 import re
 import subprocess
 from pathlib import Path
-from typing import Dict, List, Tuple, Set
+from typing import Dict, List, Tuple, Set, Optional
 from datetime import datetime
 
+# Bump when the extractors change so stale cached analyses are discarded
+CACHE_VERSION = 1
+
+# Extractor patterns, compiled once per process. Python imports, classes and
+# functions are all anchored at the start of a line, so a single pass can
+# bucket them.
+_PY_DEFINITIONS = re.compile(
+    r'^(?:(?:from\s+\S+\s+)?import\s+(?P<imp>.+)|class\s+(?P<cls>\w+)|def\s+(?P<fn>\w+))',
+    re.MULTILINE)
+_PY_CLI_ARGUMENT = re.compile(r'add_argument\([\'"]([^\'\"]+)[\'"]')
+_PY_CONFIG_KEY = re.compile(r'[\'"]([A-Z][a-zA-Z]+)[\'"]')
+_PS_PARAMETER = re.compile(r'\[Parameter[^\]]*\]\s*\[[\w\[\]]+\]\s*\$(\w+)')
+_PS_FUNCTION = re.compile(r'^function\s+(\w+)', re.MULTILINE | re.IGNORECASE)
+_PS_CMDLET_BINDING = re.compile(r'\[CmdletBinding\([^\]]*\)\]')
+_MD_HEADER = re.compile(r'^#+\s+(.+)', re.MULTILINE)
+_MD_CODE_LANGUAGE = re.compile(r'```(\w+)')
+
 class CodebaseAnalyzer:
     """Analyzes codebase changes to identify documentation update needs."""
     
-    def __init__(self, repo_path: str = "."):
+    def __init__(self, repo_path: str = ".", cache_file: Optional[str] = None):
         self.repo_path = Path(repo_path)
+        self.cache_file = Path(cache_file) if cache_file else self.repo_path / '.cache' / 'analysis.json'
+        self._cache = self._load_cache()
         self.important_files = {
             'sql_analyzer.py': 'high',
             'Analyze-SqlCode.ps1': 'high', 
@@ -31,33 +50,56 @@ class CodebaseAnalyzer:
             'examples/sample_queries.sql': 'low'
         }
         
+    def _load_cache(self) -> Dict[str, Dict[str, any]]:
+        """Load analyses of previously seen file contents."""
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == CACHE_VERSION:
+                return data.get('entries', {})
+        except (OSError, ValueError, AttributeError):
+            pass
+        return {}
+    
+    def save_cache(self):
+        """Persist the content-hash analysis cache for the next run."""
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_file, 'w', encoding='utf-8') as f:
+                json.dump({'version': CACHE_VERSION, 'entries': self._cache}, f)
+        except OSError as e:
+            print(f"Warning: Could not save analysis cache: {e}", file=sys.stderr)
+    
     def get_git_changes(self) -> Dict[str, List[str]]:
         """Get recent git changes that might affect documentation."""
         try:
-            # Get changed files in last commit
+            # Get the last commit's parents, subject and changed files in one call;
+            # merges are diffed against their first parent, like HEAD~1..HEAD
             result = subprocess.run(
-                ['git', 'diff', '--name-only', 'HEAD~1', 'HEAD'],
+                ['git', 'log', '-1', '-m', '--first-parent', '--name-only', '--pretty=format:%P%n%s'],
                 capture_output=True, text=True, cwd=self.repo_path
             )
             
-            if result.returncode != 0:
-                # Fallback to staged changes
+            commit_message = ""
+            parents = ""
+            if result.returncode == 0:
+                parents, _, rest = result.stdout.partition('\n')
+                commit_message, _, files = rest.partition('\n')
+                
+            if not parents.strip():
+                # No commits yet, or a root commit (no HEAD~1): fall back to
+                # staged changes
                 result = subprocess.run(
                     ['git', 'diff', '--cached', '--name-only'],
                     capture_output=True, text=True, cwd=self.repo_path
                 )
+                files = result.stdout
                 
-            changed_files = result.stdout.strip().split('\n') if result.stdout.strip() else []
-            
-            # Get commit message for context
-            commit_msg_result = subprocess.run(
-                ['git', 'log', '-1', '--pretty=format:%s'],
-                capture_output=True, text=True, cwd=self.repo_path
-            )
+            changed_files = files.strip().split('\n') if files.strip() else []
             
             return {
                 'changed_files': changed_files,
-                'commit_message': commit_msg_result.stdout.strip() if commit_msg_result.returncode == 0 else ""
+                'commit_message': commit_message.strip()
             }
             
         except Exception as e:
@@ -73,8 +115,17 @@ class CodebaseAnalyzer:
         changes = {}
         
         try:
-            with open(full_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            with open(full_path, 'rb') as f:
+                raw = f.read()
+            
+            # Byte-identical files reuse the previous analysis; the suffix is part
+            # of the key because it selects the extractor
+            key = f"{full_path.suffix}:{hashlib.blake2b(raw, digest_size=16).hexdigest()}"
+            if key in self._cache:
+                return self._cache[key]
+            
+            # Same newline handling as reading in text mode
+            content = raw.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
                 
             if filepath.endswith('.py'):
                 changes.update(self._analyze_python_changes(content))
@@ -84,6 +135,8 @@ class CodebaseAnalyzer:
                 changes.update(self._analyze_json_changes(content))
             elif filepath.endswith('.md'):
                 changes.update(self._analyze_markdown_changes(content))
+            
+            self._cache[key] = changes
                 
         except Exception as e:
             print(f"Warning: Could not analyze {filepath}: {e}", file=sys.stderr)
@@ -94,25 +147,22 @@ class CodebaseAnalyzer:
         """Analyze Python file for significant changes."""
         changes = {}
         
-        # Look for new imports
-        imports = re.findall(r'^(?:from\s+\S+\s+)?import\s+(.+)', content, re.MULTILINE)
-        changes['imports'] = [imp.strip() for imp in imports]
+        # Look for new imports, class definitions and function definitions
+        definitions = {'imp': [], 'cls': [], 'fn': []}
+        for match in _PY_DEFINITIONS.finditer(content):
+            definitions[match.lastgroup].append(match.group(match.lastgroup))
+        changes['imports'] = [imp.strip() for imp in definitions['imp']]
         
         # Look for command line arguments
-        argparse_patterns = re.findall(r'add_argument\([\'"]([^\'\"]+)[\'"]', content)
+        argparse_patterns = _PY_CLI_ARGUMENT.findall(content)
         changes['cli_arguments'] = argparse_patterns
         
         # Look for configuration keys
-        config_patterns = re.findall(r'[\'"]([A-Z][a-zA-Z]+)[\'"]', content)
+        config_patterns = _PY_CONFIG_KEY.findall(content)
         changes['config_keys'] = list(set(config_patterns))
         
-        # Look for class definitions
-        classes = re.findall(r'^class\s+(\w+)', content, re.MULTILINE)
-        changes['classes'] = classes
-        
-        # Look for function definitions
-        functions = re.findall(r'^def\s+(\w+)', content, re.MULTILINE)
-        changes['functions'] = functions
+        changes['classes'] = definitions['cls']
+        changes['functions'] = definitions['fn']
         
         return changes
     
@@ -121,16 +171,15 @@ class CodebaseAnalyzer:
         changes = {}
         
         # Look for parameters
-        params = re.findall(r'\[Parameter[^\]]*\]\s*\[[\w\[\]]+\]\s*\$(\w+)', content)
+        params = _PS_PARAMETER.findall(content)
         changes['parameters'] = params
         
         # Look for functions
-        functions = re.findall(r'^function\s+(\w+)', content, re.MULTILINE | re.IGNORECASE)
+        functions = _PS_FUNCTION.findall(content)
         changes['functions'] = functions
         
         # Look for cmdlet bindings
-        cmdlet_patterns = re.findall(r'\[CmdletBinding\([^\]]*\)\]', content)
-        changes['cmdlet_features'] = len(cmdlet_patterns) > 0
+        changes['cmdlet_features'] = _PS_CMDLET_BINDING.search(content) is not None
         
         return changes
     
@@ -150,11 +199,11 @@ class CodebaseAnalyzer:
         changes = {}
         
         # Count headers
-        headers = re.findall(r'^#+\s+(.+)', content, re.MULTILINE)
+        headers = _MD_HEADER.findall(content)
         changes['sections'] = headers
         
         # Look for code blocks
-        code_blocks = re.findall(r'```(\w+)', content)
+        code_blocks = _MD_CODE_LANGUAGE.findall(content)
         changes['code_languages'] = list(set(code_blocks))
         
         return changes
@@ -221,6 +270,7 @@ def main():
     """Main execution function."""
     analyzer = CodebaseAnalyzer()
     summary = analyzer.generate_change_summary()
+    analyzer.save_cache()
     
     if analyzer.should_update_claude_md(summary):
         # Output change details for the workflow
@@ -8,11 +8,58 @@ import os
 import sys
 import json
 import argparse
+import mmap
 import re
 import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import cached_property
 from pathlib import Path
-from typing import Dict, List, Optional, Any
-from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Union, Any
+
+# Extractor patterns, compiled once per process. They run over the memory-mapped
+# file bytes so only the extracted names are ever decoded; the import pattern
+# stops before '\r' so CRLF files read the same as in text mode.
+_IMPORT_RE = re.compile(rb'^(?:from\s+(\S+)\s+)?import\s+([^\r\n]+)', re.MULTILINE)
+_CLASS_RE = re.compile(rb'^class\s+(\w+)', re.MULTILINE)
+_FUNC_RE = re.compile(rb'^def\s+(\w+)', re.MULTILINE)
+# Only option names (leading '-') are captured, so positionals never match
+_CLI_ARG_RE = re.compile(rb'add_argument\([\'"](-[^\'\"]*)[\'"]')
+_PS_PARAM_RE = re.compile(rb'\[Parameter[^\]]*\]\s*(?:\[[\w\[\]]+\]\s*)?\$(\w+)', re.IGNORECASE)
+_PS_FUNC_RE = re.compile(rb'^function\s+(\w+)', re.MULTILINE | re.IGNORECASE)
+# One pass buckets tables, views and procedures by the captured object kind
+_SQL_OBJECT_RE = re.compile(rb'CREATE (TABLE|VIEW|PROCEDURE)\s+(\S+)', re.IGNORECASE)
+
+# Dependencies reported when their name appears anywhere in the analyzer.
+# Separate substring tests stop at the first occurrence and measure several
+# times faster than one regex alternation over the same names.
+_DEPENDENCY_MARKERS = tuple((name, name.encode()) for name in ('pyodbc', 'argparse', 'threading'))
+
+# File contents as scanned: a read-only mmap, or b'' for an empty file
+Buffer = Union[mmap.mmap, bytes]
+
+# Newlines are counted over slices of this size, since mmap has no count()
+_COUNT_BLOCK_SIZE = 1 << 20
+
+@contextmanager
+def _mapped(path) -> Iterator[Buffer]:
+    """Map a file read-only for the regex scans; empty files, which mmap rejects, give b''."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b''
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                yield mm
+
+def _count_newlines(buf: Buffer) -> int:
+    """Count newlines one bounded slice at a time."""
+    return sum(buf[start:start + _COUNT_BLOCK_SIZE].count(b'\n')
+               for start in range(0, len(buf), _COUNT_BLOCK_SIZE))
+
+def _decode(values: List[bytes]) -> List[str]:
+    """Decode extracted names, replacing any invalid UTF-8."""
+    return [value.decode('utf-8', 'replace') for value in values]
 
 class ClaudeMDGenerator:
     """Generates CLAUDE.md documentation from codebase analysis."""
@@ -27,81 +74,77 @@ class ClaudeMDGenerator:
         git_info = {}
         
         try:
-            # Get current commit hash
-            result = subprocess.run(['git', 'rev-parse', 'HEAD'], 
+            # One git call gives the commit hash, its ref decorations and the
+            # last commit message, one per line
+            result = subprocess.run(['git', 'log', '-1', '--format=%H%n%D%n%s'], 
                                   capture_output=True, text=True, cwd=self.input_dir)
             if result.returncode == 0:
-                git_info['commit_hash'] = result.stdout.strip()[:8]
+                commit_hash, refs, subject = (result.stdout.split('\n', 2) + ['', ''])[:3]
+                git_info['commit_hash'] = commit_hash.strip()[:8]
                 
-            # Get current branch
-            result = subprocess.run(['git', 'rev-parse', '--abbrev-ref', 'HEAD'], 
-                                  capture_output=True, text=True, cwd=self.input_dir)
-            if result.returncode == 0:
-                git_info['branch'] = result.stdout.strip()
-                
-            # Get last commit message
-            result = subprocess.run(['git', 'log', '-1', '--pretty=format:%s'], 
-                                  capture_output=True, text=True, cwd=self.input_dir)
-            if result.returncode == 0:
-                git_info['last_commit'] = result.stdout.strip()
+                # "HEAD -> branch" names the checked-out branch; a detached HEAD
+                # reports "HEAD" like rev-parse --abbrev-ref does
+                git_info['branch'] = 'HEAD'
+                for ref in refs.split(', '):
+                    if ref.startswith('HEAD -> '):
+                        git_info['branch'] = ref[len('HEAD -> '):]
+                        break
+                        
+                git_info['last_commit'] = subject.strip()
                 
         except Exception as e:
             print(f"Warning: Could not extract git info: {e}", file=sys.stderr)
             
         return git_info
     
-    def analyze_python_file(self) -> Dict[str, Any]:
-        """Analyze the main Python analyzer file."""
+    @cached_property
+    def python_analysis(self) -> Dict[str, Any]:
+        """Analyze the main Python analyzer file, once per generator."""
         python_file = self.input_dir / "sql_analyzer.py"
-        if not python_file.exists():
-            return {}
-            
+        # Each analysis opens its input directly and treats FileNotFoundError as
+        # absent, which saves a separate exists() stat per file
         try:
-            with open(python_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                
-            analysis = {
-                'imports': self._extract_imports(content),
-                'classes': self._extract_classes(content),
-                'functions': self._extract_functions(content),
-                'cli_args': self._extract_cli_arguments(content),
-                'dependencies': self._extract_dependencies(content)
-            }
+            with _mapped(python_file) as content:
+                analysis = {
+                    'imports': self._extract_imports(content),
+                    'classes': self._extract_classes(content),
+                    'functions': self._extract_functions(content),
+                    'cli_args': self._extract_cli_arguments(content),
+                    'dependencies': self._extract_dependencies(content)
+                }
             
             return analysis
             
+        except FileNotFoundError:
+            return {}
         except Exception as e:
             print(f"Error analyzing Python file: {e}", file=sys.stderr)
             return {}
     
-    def analyze_powershell_file(self) -> Dict[str, Any]:
-        """Analyze the PowerShell analyzer file."""
+    @cached_property
+    def powershell_analysis(self) -> Dict[str, Any]:
+        """Analyze the PowerShell analyzer file, once per generator."""
         ps_file = self.input_dir / "Analyze-SqlCode.ps1"
-        if not ps_file.exists():
-            return {}
-            
         try:
-            with open(ps_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                
-            analysis = {
-                'parameters': self._extract_ps_parameters(content),
-                'functions': self._extract_ps_functions(content),
-                'cmdlet_features': self._extract_ps_features(content)
-            }
+            with _mapped(ps_file) as content:
+                analysis = {
+                    'parameters': self._extract_ps_parameters(content),
+                    'functions': self._extract_ps_functions(content),
+                    'cmdlet_features': self._extract_ps_features(content)
+                }
             
             return analysis
             
+        except FileNotFoundError:
+            return {}
         except Exception as e:
             print(f"Error analyzing PowerShell file: {e}", file=sys.stderr)
             return {}
     
-    def analyze_config_file(self) -> Dict[str, Any]:
-        """Analyze the configuration file."""
+    @cached_property
+    def config_analysis(self) -> Dict[str, Any]:
+        """Analyze the configuration file, once per generator."""
         config_file = self.input_dir / "config.json"
-        if not config_file.exists():
-            return {}
-            
         try:
             with open(config_file, 'r', encoding='utf-8') as f:
                 config_data = json.load(f)
@@ -114,95 +157,120 @@ class ClaudeMDGenerator:
                 'logging': config_data.get('Logging', {})
             }
             
+        except FileNotFoundError:
+            return {}
         except Exception as e:
             print(f"Error analyzing config file: {e}", file=sys.stderr)
             return {}
     
-    def analyze_requirements(self) -> List[str]:
-        """Analyze Python requirements."""
+    @cached_property
+    def requirements(self) -> List[str]:
+        """Analyze Python requirements, once per generator."""
         req_file = self.input_dir / "requirements.txt"
-        if not req_file.exists():
-            return []
-            
         try:
+            # Filter lines as they are read instead of loading them all first
             with open(req_file, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-                
-            return [line.strip() for line in lines if line.strip() and not line.startswith('#')]
+                return [stripped for line, stripped in ((line, line.strip()) for line in f)
+                        if stripped and not line.startswith('#')]
             
+        except FileNotFoundError:
+            return []
         except Exception as e:
             print(f"Error analyzing requirements: {e}", file=sys.stderr)
             return []
     
-    def analyze_sql_files(self) -> Dict[str, Any]:
-        """Analyze SQL schema and view files."""
+    @cached_property
+    def sql_analysis(self) -> Dict[str, Any]:
+        """Analyze SQL schema and view files, once per generator."""
         sql_dir = self.input_dir / "sql"
         sql_files = {}
         
-        if sql_dir.exists():
-            for sql_file in sql_dir.glob("*.sql"):
-                try:
-                    with open(sql_file, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        
-                    sql_files[sql_file.name] = {
-                        'tables': re.findall(r'CREATE TABLE\s+(\S+)', content, re.IGNORECASE),
-                        'views': re.findall(r'CREATE VIEW\s+(\S+)', content, re.IGNORECASE),
-                        'procedures': re.findall(r'CREATE PROCEDURE\s+(\S+)', content, re.IGNORECASE),
-                        'size_lines': len(content.split('\n'))
-                    }
-                    
-                except Exception as e:
-                    print(f"Error analyzing {sql_file}: {e}", file=sys.stderr)
+        # DirEntry file-type hints avoid building and stat-ing a Path per file
+        try:
+            with os.scandir(sql_dir) as it:
+                sql_entries = [entry for entry in it if entry.name.endswith('.sql') and entry.is_file()]
+        except OSError:
+            return sql_files
+            
+        for sql_file in sql_entries:
+            try:
+                objects = {b'TABLE': [], b'VIEW': [], b'PROCEDURE': []}
+                with _mapped(sql_file.path) as content:
+                    for kind, name in _SQL_OBJECT_RE.findall(content):
+                        objects[kind.upper()].append(name)
+                    size_lines = _count_newlines(content) + 1
                     
+                sql_files[sql_file.name] = {
+                    'tables': _decode(objects[b'TABLE']),
+                    'views': _decode(objects[b'VIEW']),
+                    'procedures': _decode(objects[b'PROCEDURE']),
+                    'size_lines': size_lines
+                }
+                
+            except Exception as e:
+                print(f"Error analyzing {sql_file.path}: {e}", file=sys.stderr)
+                
         return sql_files
     
-    def _extract_imports(self, content: str) -> List[str]:
+    # Method forms of the cached analyses, kept for existing callers
+    def analyze_python_file(self) -> Dict[str, Any]:
+        """Analyze the main Python analyzer file."""
+        return self.python_analysis
+    
+    def analyze_powershell_file(self) -> Dict[str, Any]:
+        """Analyze the PowerShell analyzer file."""
+        return self.powershell_analysis
+    
+    def analyze_config_file(self) -> Dict[str, Any]:
+        """Analyze the configuration file."""
+        return self.config_analysis
+    
+    def analyze_requirements(self) -> List[str]:
+        """Analyze Python requirements."""
+        return self.requirements
+    
+    def analyze_sql_files(self) -> Dict[str, Any]:
+        """Analyze SQL schema and view files."""
+        return self.sql_analysis
+    
+    def _extract_imports(self, content: Buffer) -> List[str]:
         """Extract Python imports."""
-        imports = re.findall(r'^(?:from\s+(\S+)\s+)?import\s+(.+)', content, re.MULTILINE)
-        return [f"{imp[0]}.{imp[1]}" if imp[0] else imp[1] for imp in imports]
+        return [(match[1] + b'.' + match[2] if match[1] else match[2]).decode('utf-8', 'replace')
+                for match in _IMPORT_RE.finditer(content)]
     
-    def _extract_classes(self, content: str) -> List[str]:
+    def _extract_classes(self, content: Buffer) -> List[str]:
         """Extract Python class definitions."""
-        return re.findall(r'^class\s+(\w+)', content, re.MULTILINE)
+        return _decode(_CLASS_RE.findall(content))
     
-    def _extract_functions(self, content: str) -> List[str]:
+    def _extract_functions(self, content: Buffer) -> List[str]:
         """Extract Python function definitions."""
-        return re.findall(r'^def\s+(\w+)', content, re.MULTILINE)
+        return _decode(_FUNC_RE.findall(content))
     
-    def _extract_cli_arguments(self, content: str) -> List[str]:
+    def _extract_cli_arguments(self, content: Buffer) -> List[str]:
         """Extract command line arguments."""
-        args = re.findall(r'add_argument\([\'"]([^\'\"]+)[\'"]', content)
-        return [arg for arg in args if arg.startswith('-')]
+        return _decode(_CLI_ARG_RE.findall(content))
     
-    def _extract_dependencies(self, content: str) -> List[str]:
+    def _extract_dependencies(self, content: Buffer) -> List[str]:
         """Extract key dependencies."""
-        deps = []
-        if 'pyodbc' in content:
-            deps.append('pyodbc')
-        if 'argparse' in content:
-            deps.append('argparse')
-        if 'threading' in content:
-            deps.append('threading')
-        return deps
+        return [name for name, marker in _DEPENDENCY_MARKERS if content.find(marker) >= 0]
     
-    def _extract_ps_parameters(self, content: str) -> List[str]:
+    def _extract_ps_parameters(self, content: Buffer) -> List[str]:
         """Extract PowerShell parameters."""
-        params = re.findall(r'\[Parameter[^\]]*\]\s*(?:\[[\w\[\]]+\]\s*)?\$(\w+)', content, re.IGNORECASE)
-        return params
+        params = _PS_PARAM_RE.findall(content)
+        return _decode(params)
     
-    def _extract_ps_functions(self, content: str) -> List[str]:
+    def _extract_ps_functions(self, content: Buffer) -> List[str]:
         """Extract PowerShell functions."""
-        return re.findall(r'^function\s+(\w+)', content, re.MULTILINE | re.IGNORECASE)
+        return _decode(_PS_FUNC_RE.findall(content))
     
-    def _extract_ps_features(self, content: str) -> List[str]:
+    def _extract_ps_features(self, content: Buffer) -> List[str]:
         """Extract PowerShell advanced features."""
         features = []
-        if '[CmdletBinding()]' in content:
+        if content.find(b'[CmdletBinding()]') >= 0:
             features.append('CmdletBinding')
-        if 'ValidateSet' in content:
+        if content.find(b'ValidateSet') >= 0:
             features.append('Parameter Validation')
-        if 'Begin {' in content:
+        if content.find(b'Begin {') >= 0:
             features.append('Advanced Function Structure')
         return features
     
@@ -211,37 +279,46 @@ class ClaudeMDGenerator:
                           build_url: Optional[str] = None) -> str:
         """Generate the complete CLAUDE.md content."""
         
-        # Analyze all components
-        python_analysis = self.analyze_python_file()
-        ps_analysis = self.analyze_powershell_file()
-        config_analysis = self.analyze_config_file()
-        requirements = self.analyze_requirements()
-        sql_analysis = self.analyze_sql_files()
+        # Analyze all components. Each reads its own files, so they run side by
+        # side and a cold disk cache costs the slowest read rather than the sum.
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            python_future = executor.submit(self.analyze_python_file)
+            ps_future = executor.submit(self.analyze_powershell_file)
+            config_future = executor.submit(self.analyze_config_file)
+            requirements_future = executor.submit(self.analyze_requirements)
+            sql_future = executor.submit(self.analyze_sql_files)
+            
+        python_analysis = python_future.result()
+        ps_analysis = ps_future.result()
+        config_analysis = config_future.result()
+        requirements = requirements_future.result()
+        sql_analysis = sql_future.result()
         
-        # Generate timestamp info
-        timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
+        # Generate timestamp info once for the header and footer; time.gmtime
+        # avoids the deprecated datetime.utcnow()
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime())
         
         # Build header with generation info
-        header = f"""# CLAUDE.md
+        parts = [f"""# CLAUDE.md
 
 This file provides guidance to Claude Code (claude.ai/code) when working with code in this repository.
 
-<!-- Auto-generated on {timestamp} -->"""
+<!-- Auto-generated on {timestamp} -->"""]
         
         if self.include_git_info and self.git_info:
-            header += f"""
-<!-- Git Info: {self.git_info.get('branch', 'unknown')} @ {self.git_info.get('commit_hash', 'unknown')} -->"""
+            parts.append(f"""
+<!-- Git Info: {self.git_info.get('branch', 'unknown')} @ {self.git_info.get('commit_hash', 'unknown')} -->""")
             
         if build_id:
-            header += f"""
-<!-- Build: {build_id} -->"""
+            parts.append(f"""
+<!-- Build: {build_id} -->""")
             
         if build_url:
-            header += f"""
-<!-- Build URL: {build_url} -->"""
+            parts.append(f"""
+<!-- Build URL: {build_url} -->""")
         
         # Generate main content sections
-        content = f"""{header}
+        parts.append(f"""
 
 ## Project Overview
 
@@ -284,30 +361,30 @@ python sql_analyzer.py --directory "C:\\MyProject" --server "localhost" --databa
 # Or execute manually in SSMS:
 # 1. Execute sql/database_schema.sql
 # 2. Execute sql/analysis_views.sql
-```"""
+```""")
 
         # Add CLI arguments section if available
         if python_analysis.get('cli_args'):
-            content += f"""
+            parts.append(f"""
 
 ### Available Command Line Arguments
 ```bash
 # Python analyzer supports:
 {chr(10).join(f"# {arg}" for arg in python_analysis['cli_args'])}
-```"""
+```""")
 
         # Add PowerShell parameters if available
         if ps_analysis.get('parameters'):
-            content += f"""
+            parts.append(f"""
 
 ### PowerShell Parameters
 ```powershell
 # Available parameters:
 {chr(10).join(f"# -{param}" for param in ps_analysis['parameters'])}
-```"""
+```""")
 
         # Architecture section
-        content += f"""
+        parts.append(f"""
 
 ## Architecture Overview
 
@@ -315,37 +392,37 @@ python sql_analyzer.py --directory "C:\\MyProject" --server "localhost" --databa
 
 1. **sql_analyzer.py**: Main Python implementation with database connectivity via pyodbc
 2. **Analyze-SqlCode.ps1**: PowerShell equivalent with SqlServer module integration
-3. **config.json**: Configuration file for analysis settings, patterns, and database options"""
+3. **config.json**: Configuration file for analysis settings, patterns, and database options""")
 
         # Add SQL files info
         if sql_analysis:
             for sql_file, info in sql_analysis.items():
-                content += f"""
-4. **sql/{sql_file}**: {info.get('size_lines', 0)} lines"""
+                parts.append(f"""
+4. **sql/{sql_file}**: {info.get('size_lines', 0)} lines""")
                 if info.get('tables'):
-                    content += f" - {len(info['tables'])} tables"
+                    parts.append(f" - {len(info['tables'])} tables")
                 if info.get('views'):
-                    content += f" - {len(info['views'])} views"
+                    parts.append(f" - {len(info['views'])} views")
 
         # Add classes and functions info
         if python_analysis.get('classes'):
-            content += f"""
+            parts.append(f"""
 
 ### Key Classes and Functions
 
 **Python Classes:**
-{chr(10).join(f"- **{cls}**: Core analysis component" for cls in python_analysis['classes'])}"""
+{chr(10).join(f"- **{cls}**: Core analysis component" for cls in python_analysis['classes'])}""")
 
         if python_analysis.get('functions'):
             main_functions = [f for f in python_analysis['functions'] if not f.startswith('_')][:5]
             if main_functions:
-                content += f"""
+                parts.append(f"""
 
 **Main Functions:**
-{chr(10).join(f"- `{func}()`: Primary processing function" for func in main_functions)}"""
+{chr(10).join(f"- `{func}()`: Primary processing function" for func in main_functions)}""")
 
         # Database integration section
-        content += """
+        parts.append("""
 
 ### Database Integration
 
@@ -361,26 +438,26 @@ The tool detects:
 - **Entity Framework**: DbContext, DbSet, FromSqlRaw, ExecuteSqlRaw
 - **Dynamic SQL**: String concatenation, StringBuilder patterns
 - **Configuration**: Connection strings in app.config, web.config, appsettings.json
-- **Multi-language**: C#, VB.NET, JavaScript, TypeScript, Python, SQL files"""
+- **Multi-language**: C#, VB.NET, JavaScript, TypeScript, Python, SQL files""")
 
         # Configuration section
         if config_analysis:
-            content += f"""
+            parts.append(f"""
 
 ## Critical Configuration
 
 ### Analysis Settings
 ```json
-{{"""
+{{""")
             for section in config_analysis.get('sections', []):
-                content += f"""
-  "{section}": {{ /* Configuration options */ }}"""
-            content += """
+                parts.append(f"""
+  "{section}": {{ /* Configuration options */ }}""")
+            parts.append("""
 }
-```"""
+```""")
 
         # Add WSL configuration
-        content += """
+        parts.append("""
 
 ### WSL SQL Server Connection
 When running from WSL, use the WSL host IP instead of localhost:
@@ -394,10 +471,10 @@ python sql_analyzer.py --server "172.31.208.1,14333" --database "CodeAnalysis" -
 {
   "connectionString": "Server=172.31.208.1,14333;Database=CodeAnalysis;User Id=sv;Password=YourPassword;TrustServerCertificate=true;"
 }
-```"""
+```""")
 
         # File structure section
-        content += """
+        parts.append("""
 
 ## File Structure
 
@@ -418,10 +495,10 @@ sqldepends/
     ├── REQUIREMENTS.md       # Detailed requirements
     ├── PROJECT_STATUS.md     # Implementation status
     └── TODO.md               # Development roadmap
-```"""
+```""")
 
         # Common scenarios section
-        content += """
+        parts.append("""
 
 ## Common Analysis Scenarios
 
@@ -450,21 +527,21 @@ SELECT * FROM CodeAnalysis.vw_SqlObjectUsage
 
 -- Check for changes between runs
 SELECT * FROM CodeAnalysis.vw_CodeAnalysisChanges
-```"""
+```""")
 
         # Dependencies section
         if requirements:
-            content += f"""
+            parts.append(f"""
 
 ## Dependencies
 
 ### Python Requirements
 ```
 {chr(10).join(requirements)}
-```"""
+```""")
 
         # Testing and troubleshooting
-        content += """
+        parts.append("""
 
 ## Development Guidelines
 
@@ -515,27 +592,27 @@ python sql_analyzer.py --directory "C:\\LargeProject" --parallel-processing --ge
 ```bash
 # Enable verbose logging
 python sql_analyzer.py --directory "C:\\MyProject" --log-level DEBUG --log-file "analysis.log"
-```"""
+```""")
 
         # Add generation footer
         if changes_summary:
-            content += f"""
+            parts.append(f"""
 
 ---
 **Documentation automatically updated based on:**
 ```
 {changes_summary}
-```"""
+```""")
 
-        content += f"""
+        parts.append(f"""
 
-*Generated: {timestamp}*"""
+*Generated: {timestamp}*""")
         if self.git_info.get('commit_hash'):
-            content += f" | *Commit: {self.git_info['commit_hash']}*"
+            parts.append(f" | *Commit: {self.git_info['commit_hash']}*")
         if build_id:
-            content += f" | *Build: {build_id}*"
+            parts.append(f" | *Build: {build_id}*")
 
-        return content
+        return "".join(parts)
 
 def main():
     """Main execution function."""
@@ -551,10 +628,12 @@ def main():
     
     # Read changes summary if provided
     changes_summary = None
-    if args.changes_summary and Path(args.changes_summary).exists():
+    if args.changes_summary:
         try:
             with open(args.changes_summary, 'r') as f:
                 changes_summary = f.read().strip()
+        except FileNotFoundError:
+            pass
         except Exception as e:
             print(f"Warning: Could not read changes summary: {e}", file=sys.stderr)
     
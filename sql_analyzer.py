@@ -14,6 +14,7 @@ import json
 import argparse
 import logging
 import sys
+import time
 import hashlib
 import uuid
 from pathlib import Path
@@ -86,6 +87,10 @@ def setup_logging(log_level: str = 'INFO', log_file: Optional[str] = None):
 
 logger = logging.getLogger(__name__)
 
+# Batch separator: a line holding only GO, in any case, with any surrounding
+# whitespace or line ending
+_GO_SPLIT = re.compile(r'(?im)^\s*GO\s*$')
+
 @dataclass
 class SqlReference:
     """Represents a SQL object reference found in source code."""
@@ -119,6 +124,35 @@ class SqlReference:
     risk_flags: Optional[str]
     notes: Optional[str]
 
+# SqlReference fields stored in CodeAnalysis.CodeAnalysisHistory, by column name
+CODE_ANALYSIS_HISTORY_COLUMNS = {
+    'line_number': 'LineNumber',
+    'code_block_type': 'CodeBlockType',
+    'code_block_name': 'CodeBlockName',
+    'namespace_name': 'NamespaceName',
+    'class_name': 'ClassName',
+    'method_name': 'MethodName',
+    'sql_object_type': 'SqlObjectType',
+    'schema_name': 'SchemaName',
+    'object_name': 'ObjectName',
+    'column_name': 'ColumnName',
+    'parameter_name': 'ParameterName',
+    'parameter_type': 'ParameterType',
+    'parameter_direction': 'ParameterDirection',
+    'sql_statement': 'SqlStatement',
+    'adonet_object_type': 'AdoNetObjectType',
+    'adonet_property': 'AdoNetProperty',
+    'connection_string_name': 'ConnectionStringName',
+    'database_name': 'DatabaseName',
+    'command_type': 'CommandType',
+    'source_code_snippet': 'SourceCodeSnippet',
+    'confidence': 'Confidence',
+    'detection_method': 'DetectionMethod',
+    'is_deprecated': 'IsDeprecated',
+    'risk_flags': 'RiskFlags',
+    'notes': 'Notes',
+}
+
 class FileInfo(NamedTuple):
     """File information for analysis."""
     path: str
@@ -152,6 +186,14 @@ class DatabaseManager:
         
         self.connection_string = connection_string
         self.test_connection()
+        # One connection serves every script and insert for the life of the manager
+        self._conn = pyodbc.connect(self.connection_string, autocommit=False)
+    
+    def close(self):
+        """Close the database connection."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
     
     def test_connection(self):
         """Test database connection."""
@@ -167,24 +209,26 @@ class DatabaseManager:
     def execute_script_file(self, script_file: str):
         """Execute a SQL script file."""
         try:
-            with open(script_file, 'r', encoding='utf-8') as f:
-                script_content = f.read()
+            # Decode once, without newline translation; utf-8-sig drops a leading BOM,
+            # which would otherwise be sent as part of the first batch
+            with open(script_file, 'rb') as f:
+                script_content = f.read().decode('utf-8-sig', errors='replace')
             
             # Split script by GO statements and execute each batch
-            batches = script_content.split('\nGO\n')
+            batches = _GO_SPLIT.split(script_content)
             
-            with pyodbc.connect(self.connection_string) as conn:
-                cursor = conn.cursor()
-                
-                for batch in batches:
-                    batch = batch.strip()
-                    if batch and not batch.startswith('--'):
-                        try:
-                            cursor.execute(batch)
-                            conn.commit()
-                        except Exception as e:
-                            logger.warning(f"Error executing batch: {e}")
-                            logger.debug(f"Batch content: {batch[:200]}...")
+            conn = self._conn
+            cursor = conn.cursor()
+            
+            for batch in batches:
+                batch = batch.strip()
+                if batch and not batch.startswith('--'):
+                    try:
+                        cursor.execute(batch)
+                        conn.commit()
+                    except Exception as e:
+                        logger.warning(f"Error executing batch: {e}")
+                        logger.debug(f"Batch content: {batch[:200]}...")
                             
             logger.info(f"Successfully executed script: {script_file}")
             
@@ -192,6 +236,40 @@ class DatabaseManager:
             logger.error(f"Error executing script file {script_file}: {e}")
             raise
     
+    def bulk_insert(self, table: str, columns: List[str], params: List[tuple]) -> int:
+        """Insert parameter rows into the given table columns in one batched round-trip."""
+        if not params:
+            return 0
+        
+        placeholders = ', '.join('?' * len(columns))
+        try:
+            cursor = self._conn.cursor()
+            # Send the parameter array as one bulk operation instead of a
+            # prepare/execute round-trip per row
+            cursor.fast_executemany = True
+            cursor.executemany(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", params)
+            self._conn.commit()
+            logger.info(f"Inserted {len(params)} rows into {table}")
+            return len(params)
+        except Exception as e:
+            self._conn.rollback()
+            logger.error(f"Error inserting rows into {table}: {e}")
+            raise
+    
+    def insert_code_analysis_history(self, run_id: str, references: List[Tuple[int, SqlReference]]) -> int:
+        """Store references as CodeAnalysis.CodeAnalysisHistory rows.
+        
+        Each reference is paired with the FileHistoryId of the FileAnalysisHistory
+        row for its file; the file columns themselves live in that table.
+        """
+        columns = ['RunId', 'FileHistoryId', *CODE_ANALYSIS_HISTORY_COLUMNS.values()]
+        # getattr per field avoids the recursive copy asdict() makes of every row
+        params = [
+            (run_id, file_history_id, *(getattr(reference, field) for field in CODE_ANALYSIS_HISTORY_COLUMNS))
+            for file_history_id, reference in references
+        ]
+        return self.bulk_insert('CodeAnalysis.CodeAnalysisHistory', columns, params)
+    
     def ensure_schema_exists(self):
         """Ensure database schema exists."""
         schema_script = """
@@ -204,10 +282,9 @@ class DatabaseManager:
         """
         
         try:
-            with pyodbc.connect(self.connection_string) as conn:
-                cursor = conn.cursor()
-                cursor.execute(schema_script)
-                conn.commit()
+            cursor = self._conn.cursor()
+            cursor.execute(schema_script)
+            self._conn.commit()
         except Exception as e:
             logger.error(f"Error creating schema: {e}")
             raise
@@ -302,6 +379,7 @@ Examples:
     if not args.windows_auth and args.server and (not args.username or not args.password):
         parser.error("Username and password required for SQL Server authentication (or use --windows-auth)")
     
+    db_manager = None
     try:
         # Load configuration
         config = Config(args.config_file)
@@ -309,7 +387,6 @@ Examples:
         config.max_degree_of_parallelism = args.max_workers
         
         # Setup database connection if specified
-        db_manager = None
         if not args.dry_run and (args.connection_string or args.server):
             db_manager = DatabaseManager(
                 connection_string=args.connection_string,
@@ -328,18 +405,22 @@ Examples:
                     db_manager.execute_script_file(args.views_file)
         
         # Perform basic analysis (simplified for this version)
-        start_time = datetime.now()
+        # Monotonic clock, so an NTP step cannot skew the measured duration
+        start_ns = time.perf_counter_ns()
         
         # Find files
         files_found = 0
+        # str.endswith takes a tuple and checks every suffix in one call;
+        # directory names are looked up in a set rather than scanned in a list
+        supported_extensions = tuple(config.supported_extensions)
+        exclude_directories = frozenset(config.exclude_directories)
         for root, dirs, files in os.walk(args.directory):
-            dirs[:] = [d for d in dirs if d not in config.exclude_directories]
+            dirs[:] = [d for d in dirs if d not in exclude_directories]
             for file in files:
-                if any(file.endswith(ext) for ext in config.supported_extensions):
+                if file.endswith(supported_extensions):
                     files_found += 1
         
-        end_time = datetime.now()
-        processing_time_ms = int((end_time - start_time).total_seconds() * 1000)
+        processing_time_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
         
         # Generate run ID
         run_id = str(uuid.uuid4())
@@ -368,6 +449,9 @@ Examples:
             import traceback
             traceback.print_exc()
         sys.exit(1)
+    finally:
+        if db_manager:
+            db_manager.close()
 
 if __name__ == '__main__':
     main()
@@ -6,16 +6,188 @@ Performs a simple, safe analysis of the MBox Platform project structure and file
 
 import os
 import json
+import mmap
 import re
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from fnmatch import fnmatch
 from pathlib import Path
 from datetime import datetime
 from collections import defaultdict
+from typing import Optional
+
+# Faster JSON encoding when available
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Optional multi-pattern scanner; the stdlib re path is used without it
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+# Detection patterns as (source, regex) pairs; reports use each pattern's source.
+# Files are scanned as raw bytes, case-folded once and searched with lower-case
+# bytes regexes, which keeps each literal prefix available to re's fast search
+# where IGNORECASE (or one alternation of all twelve) would try every position.
+# The patterns only use lower-case escapes (\s, \w), so lower() leaves them intact.
+_SQL_PATTERNS = tuple((pattern, re.compile(pattern.lower().encode())) for pattern in (
+    r'SELECT\s+.*\s+FROM\s+\w+',
+    r'INSERT\s+INTO\s+\w+',
+    r'UPDATE\s+\w+\s+SET',
+    r'DELETE\s+FROM\s+\w+',
+    r'CREATE\s+(TABLE|VIEW|PROCEDURE)',
+    r'SqlCommand',
+    r'SqlConnection',
+    r'CommandText\s*=',
+    r'FromSqlRaw',
+    r'ExecuteSqlRaw',
+    r'DbContext',
+    r'DbSet<'
+))
+
+# Every pattern opens with a literal word; a substring test for it is a single
+# fast C scan, so the regex only runs on files that contain that word
+_SQL_LITERALS = tuple(re.match(r'[A-Za-z<]+', pattern).group().lower().encode() for pattern, _ in _SQL_PATTERNS)
+
+# Connection-string keys, matched against lower-cased content (see has_connection_string)
+_CONNECTION_KEY_RE = re.compile(rb'server\s*=|database\s*=')
+_CREATE_PROCEDURE_RE = re.compile(rb'CREATE\s+PROCEDURE', re.IGNORECASE)
+_CREATE_TABLE_RE = re.compile(rb'CREATE\s+TABLE', re.IGNORECASE)
+_CREATE_VIEW_RE = re.compile(rb'CREATE\s+VIEW', re.IGNORECASE)
+
+def _compile_hyperscan_db():
+    """Compile all SQL patterns into one Hyperscan database, or None if unavailable."""
+    if not HYPERSCAN_AVAILABLE:
+        return None
+    try:
+        db = hyperscan.Database()
+        db.compile(
+            expressions=[pattern.encode() for pattern, _ in _SQL_PATTERNS],
+            ids=list(range(len(_SQL_PATTERNS))),
+            flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(_SQL_PATTERNS)
+        )
+        return db
+    except hyperscan.error as e:
+        print(f"Warning: Hyperscan compile failed, using re: {e}")
+        return None
+
+_HYPERSCAN_DB = _compile_hyperscan_db()
+
+def match_sql_patterns(content) -> list:
+    """Return the source of every SQL pattern found in a file's bytes, in pattern order."""
+    if _HYPERSCAN_DB is not None:
+        # One scan reports each pattern at most once (SINGLEMATCH), and stops
+        # as soon as every pattern has been seen
+        hits = set()
+        
+        def on_match(pattern_id, start, end, flags, context):
+            hits.add(pattern_id)
+            return len(hits) == len(_SQL_PATTERNS)
+            
+        try:
+            _HYPERSCAN_DB.scan(bytes(content), match_event_handler=on_match)
+        except hyperscan.ScanTerminated:
+            # Raised when on_match stops the scan; every pattern was found
+            pass
+        return [_SQL_PATTERNS[i][0] for i in sorted(hits)]
+        
+    # Each search stops at its first hit, so a file is only scanned as far as
+    # each pattern needs
+    lowered = content[:].lower()
+    return [
+        pattern for (pattern, rx), literal in zip(_SQL_PATTERNS, _SQL_LITERALS)
+        if literal in lowered and rx.search(lowered)
+    ]
+
+def has_connection_string(content) -> bool:
+    """Whether a configuration file's bytes mention a connection string or its keys."""
+    lowered = content[:].lower()
+    if lowered.find(b'connectionstring') >= 0:
+        return True
+    # The regex is only needed to allow whitespace before '=', so it runs only
+    # when one of the key words is present at all
+    return ((lowered.find(b'server') >= 0 or lowered.find(b'database') >= 0)
+            and _CONNECTION_KEY_RE.search(lowered) is not None)
+
+# Configuration files that may hold connection strings
+CONFIG_PATTERNS = ('appsettings*.json', '*.config', 'web.config', 'app.config')
+
+# Build output directories skipped by every scan, as well as hidden directories
+PRUNE_DIRS = frozenset({'bin', 'obj'})
+
+# Files above MAX_FILE_SIZE (usually generated code) are skipped; larger files
+# below it are only pattern-scanned over their first MAX_SCAN_BYTES
+MAX_FILE_SIZE = 5 * 1024 * 1024
+MAX_SCAN_BYTES = 512 * 1024
+
+# Per-directory counters kept for each file suffix in the project structure
+SUFFIX_COUNTERS = {'.cs': 'cs_files', '.sql': 'sql_files', '.json': 'json_files'}
+
+# Newlines are counted over slices of this size, since mmap has no count()
+_COUNT_BLOCK_SIZE = 1 << 20
+
+@contextmanager
+def _mapped(path):
+    """Map a file read-only; empty files, which mmap rejects, give b''."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b''
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                yield mm
+
+def _count_lines(content) -> int:
+    """Count lines one bounded slice at a time; a trailing newline ends the last line."""
+    if not len(content):
+        return 0
+    newlines = sum(content[start:start + _COUNT_BLOCK_SIZE].count(b'\n')
+                   for start in range(0, len(content), _COUNT_BLOCK_SIZE))
+    return newlines + (0 if content[-1:] == b'\n' else 1)
+
+def _scan_cs_file(path: str, max_scan_bytes: int = MAX_SCAN_BYTES):
+    """Worker: return (patterns found, file size) for one C# file, or None on error."""
+    try:
+        with _mapped(path) as content:
+            matches = match_sql_patterns(content[:max_scan_bytes])
+            return matches, (len(content) if matches else 0)
+    except Exception as e:
+        print(f"Error analyzing {path}: {e}")
+        return None
+
+def _analyze_sql_file(path: str, max_scan_bytes: int = MAX_SCAN_BYTES):
+    """Worker: return size, line count and CREATE flags for one SQL file, or None on error."""
+    try:
+        with _mapped(path) as content:
+            return {
+                'size': len(content),
+                'lines': _count_lines(content),
+                'has_procedures': bool(_CREATE_PROCEDURE_RE.search(content, 0, max_scan_bytes)),
+                'has_tables': bool(_CREATE_TABLE_RE.search(content, 0, max_scan_bytes)),
+                'has_views': bool(_CREATE_VIEW_RE.search(content, 0, max_scan_bytes))
+            }
+    except Exception as e:
+        print(f"Error analyzing SQL file {path}: {e}")
+        return None
 
 class MBoxAnalyzer:
     """Simple analyzer for MBox Platform project."""
     
-    def __init__(self, mbox_path: str):
+    def __init__(self, mbox_path: str, max_workers: Optional[int] = None, max_files: Optional[int] = None,
+                 max_file_size: int = MAX_FILE_SIZE, max_scan_bytes: int = MAX_SCAN_BYTES):
         self.mbox_path = Path(mbox_path)
+        self.max_workers = max_workers
+        self.max_files = max_files
+        self.max_file_size = max_file_size
+        self.max_scan_bytes = max_scan_bytes
+        self._tree = None
+        # Walked paths all start with this prefix, so relative paths are a slice
+        self._root_prefix = str(self.mbox_path) + os.sep
         self.results = {
             'analysis_timestamp': datetime.now().isoformat(),
             'project_path': str(self.mbox_path),
@@ -44,7 +216,14 @@ class MBoxAnalyzer:
     def _analyze_directory(self, directory: Path, max_depth: int = 2, current_depth: int = 0):
         """Analyze a directory structure."""
         if current_depth >= max_depth:
-            return {"files": len(list(directory.glob('*'))), "truncated": True}
+            # Every entry, dot names included, as glob('*') counted them; 0 if unreadable
+            count = 0
+            try:
+                with os.scandir(directory) as it:
+                    count = sum(1 for _ in it)
+            except OSError:
+                pass
+            return {"files": count, "truncated": True}
             
         info = {
             "files": 0,
@@ -55,133 +234,144 @@ class MBoxAnalyzer:
         }
         
         try:
-            for item in directory.iterdir():
-                if item.is_file():
-                    info["files"] += 1
-                    if item.suffix == '.cs':
-                        info["cs_files"] += 1
-                    elif item.suffix == '.sql':
-                        info["sql_files"] += 1
-                    elif item.suffix == '.json':
-                        info["json_files"] += 1
-                elif item.is_dir() and not item.name.startswith('.') and item.name not in ['bin', 'obj']:
-                    info["subdirectories"][item.name] = self._analyze_directory(
-                        item, max_depth, current_depth + 1
-                    )
+            # DirEntry type checks reuse the d_type from readdir instead of a stat per item
+            with os.scandir(directory) as it:
+                for item in it:
+                    if item.is_file():
+                        info["files"] += 1
+                        counter = SUFFIX_COUNTERS.get(os.path.splitext(item.name)[1])
+                        if counter:
+                            info[counter] += 1
+                    elif item.is_dir() and not item.name.startswith('.') and item.name not in PRUNE_DIRS:
+                        info["subdirectories"][item.name] = self._analyze_directory(
+                            item.path, max_depth, current_depth + 1
+                        )
         except PermissionError:
             info["error"] = "Permission denied"
             
         return info
     
+    def _classify_tree(self) -> dict:
+        """Bin C#, SQL and configuration file paths from a single walk of the project."""
+        if self._tree is not None:
+            return self._tree
+            
+        tree = {'cs': [], 'sql': [], 'config': []}
+        
+        def visit(directory: str):
+            subdirs = []
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        name = entry.name
+                        if entry.is_dir():
+                            if not entry.is_symlink() and not name.startswith('.') and name not in PRUNE_DIRS:
+                                subdirs.append(entry.path)
+                            continue
+                        if name.endswith('.cs'):
+                            kind = 'cs'
+                        elif name.endswith('.sql'):
+                            kind = 'sql'
+                        elif any(fnmatch(name, pattern) for pattern in CONFIG_PATTERNS):
+                            kind = 'config'
+                        else:
+                            continue
+                        try:
+                            # entry.stat() is cached on the DirEntry, so the size costs one call
+                            size = entry.stat().st_size
+                        except OSError:
+                            # A dangling symlink or a file removed mid-walk; skip just this entry
+                            continue
+                        tree[kind].append((entry.path, size))
+            except OSError:
+                # Only an unreadable directory ends its listing
+                return
+            # Same pre-order as rglob: a directory's files, then its subdirectories
+            for subdir in subdirs:
+                visit(subdir)
+                
+        visit(str(self.mbox_path))
+        self._tree = tree
+        return tree
+    
+    def _rel(self, path: str) -> str:
+        """Path relative to the project root."""
+        if path.startswith(self._root_prefix):
+            return path[len(self._root_prefix):]
+        return os.path.relpath(path, self.mbox_path)
+    
+    def _files(self, kind: str) -> list:
+        """Paths of one kind of file from the classified tree, skipping files over max_file_size."""
+        return [path for path, size in self._classify_tree()[kind] if size <= self.max_file_size]
+    
+    def _map_files(self, worker, paths: list) -> list:
+        """Run a per-file worker over paths, in worker processes unless max_workers is 1."""
+        if self.max_workers == 1 or len(paths) < 2:
+            return [worker(path) for path in paths]
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(worker, paths, chunksize=32))
+    
     def find_cs_files_with_sql(self):
         """Find C# files that likely contain SQL code."""
-        sql_patterns = [
-            r'SELECT\s+.*\s+FROM\s+\w+',
-            r'INSERT\s+INTO\s+\w+',
-            r'UPDATE\s+\w+\s+SET',
-            r'DELETE\s+FROM\s+\w+',
-            r'CREATE\s+(TABLE|VIEW|PROCEDURE)',
-            r'SqlCommand',
-            r'SqlConnection',
-            r'CommandText\s*=',
-            r'FromSqlRaw',
-            r'ExecuteSqlRaw',
-            r'DbContext',
-            r'DbSet<'
-        ]
-        
-        cs_files = []
-        try:
-            cs_files = list(self.mbox_path.rglob('*.cs'))
-        except:
-            print("Error scanning for C# files")
-            return []
-            
+        cs_files = self._files('cs')
         sql_files = []
+        if self.max_files is not None:
+            cs_files = cs_files[:self.max_files]
         
-        for cs_file in cs_files[:50]:  # Limit to first 50 files for safety
-            try:
-                with open(cs_file, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    
-                matches = []
-                for pattern in sql_patterns:
-                    if re.search(pattern, content, re.IGNORECASE):
-                        matches.append(pattern)
-                        
-                if matches:
-                    relative_path = str(cs_file.relative_to(self.mbox_path))
-                    sql_files.append({
-                        'file': relative_path,
-                        'patterns_found': matches,
-                        'file_size': cs_file.stat().st_size if cs_file.exists() else 0
-                    })
-                    
-            except Exception as e:
-                print(f"Error analyzing {cs_file}: {e}")
+        # Files are scanned independently, so the regex work is spread over processes
+        results = self._map_files(partial(_scan_cs_file, max_scan_bytes=self.max_scan_bytes), cs_files)
+        for cs_file, result in zip(cs_files, results):
+            if result is None:
                 continue
+            matches, file_size = result
+            if matches:
+                relative_path = self._rel(cs_file)
+                sql_files.append({
+                    'file': relative_path,
+                    'patterns_found': matches,
+                    'file_size': file_size
+                })
                 
         return sql_files
     
     def find_configuration_files(self):
         """Find configuration files that might contain connection strings."""
         config_files = []
-        config_patterns = ['appsettings*.json', '*.config', 'web.config', 'app.config']
         
-        for pattern in config_patterns:
+        # Each file is listed once, even when several patterns match its name
+        for file, size in self._classify_tree()['config']:
+            if size > self.max_file_size:
+                continue
             try:
-                files = list(self.mbox_path.rglob(pattern))
-                for file in files:
-                    try:
-                        relative_path = str(file.relative_to(self.mbox_path))
-                        file_info = {
-                            'file': relative_path,
-                            'size': file.stat().st_size,
-                            'has_connection_strings': False
-                        }
+                relative_path = self._rel(file)
+                file_info = {
+                    'file': relative_path,
+                    'size': size,
+                    'has_connection_strings': False
+                }
+                
+                # Check for connection strings
+                with _mapped(file) as content:
+                    if has_connection_string(content[:self.max_scan_bytes]):
+                        file_info['has_connection_strings'] = True
                         
-                        # Check for connection strings
-                        with open(file, 'r', encoding='utf-8', errors='ignore') as f:
-                            content = f.read()
-                            if re.search(r'connectionstring|server\s*=|database\s*=', content, re.IGNORECASE):
-                                file_info['has_connection_strings'] = True
-                                
-                        config_files.append(file_info)
-                    except Exception as e:
-                        print(f"Error analyzing config file {file}: {e}")
-            except:
-                continue
+                config_files.append(file_info)
+            except Exception as e:
+                print(f"Error analyzing config file {file}: {e}")
                 
         return config_files
     
     def analyze_sql_files(self):
         """Find and analyze SQL files."""
         sql_files = []
+        sql_paths = self._files('sql')
         
-        try:
-            for sql_file in self.mbox_path.rglob('*.sql'):
-                try:
-                    relative_path = str(sql_file.relative_to(self.mbox_path))
-                    
-                    with open(sql_file, 'r', encoding='utf-8', errors='ignore') as f:
-                        content = f.read()
-                        
-                    sql_info = {
-                        'file': relative_path,
-                        'size': sql_file.stat().st_size,
-                        'lines': len(content.split('\n')),
-                        'has_procedures': bool(re.search(r'CREATE\s+PROCEDURE', content, re.IGNORECASE)),
-                        'has_tables': bool(re.search(r'CREATE\s+TABLE', content, re.IGNORECASE)),
-                        'has_views': bool(re.search(r'CREATE\s+VIEW', content, re.IGNORECASE))
-                    }
-                    
-                    sql_files.append(sql_info)
-                    
-                except Exception as e:
-                    print(f"Error analyzing SQL file {sql_file}: {e}")
-        except:
-            print("Error scanning for SQL files")
-            
+        results = self._map_files(partial(_analyze_sql_file, max_scan_bytes=self.max_scan_bytes), sql_paths)
+        for sql_file, sql_info in zip(sql_paths, results):
+            if sql_info is not None:
+                relative_path = self._rel(sql_file)
+                sql_files.append({'file': relative_path, **sql_info})
+                
         return sql_files
     
     def run_analysis(self):
@@ -219,8 +409,20 @@ class MBoxAnalyzer:
     def save_results(self, output_file: str):
         """Save results to a JSON file."""
         try:
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(self.results, f, indent=2)
+            encoded = None
+            if ORJSON_AVAILABLE:
+                # orjson encodes the whole document natively, straight to bytes
+                try:
+                    encoded = orjson.dumps(self.results, option=orjson.OPT_INDENT_2)
+                except orjson.JSONEncodeError:
+                    # e.g. surrogate-escaped (non-UTF-8) file names, which json accepts
+                    pass
+            if encoded is not None:
+                with open(output_file, 'wb') as f:
+                    f.write(encoded)
+            else:
+                with open(output_file, 'w', encoding='utf-8') as f:
+                    json.dump(self.results, f, indent=2)
             print(f"Results saved to: {output_file}")
         except Exception as e:
             print(f"Error saving results: {e}")
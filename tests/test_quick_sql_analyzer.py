@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Tests for pattern compilation in quick-sql-analyzer.py.
+"""
+
+import importlib.util
+import re
+import unittest
+from pathlib import Path
+
+# The script name has a hyphen, so it is loaded from its path
+_SPEC = importlib.util.spec_from_file_location(
+    'quick_sql_analyzer', Path(__file__).resolve().parent.parent / 'quick-sql-analyzer.py'
+)
+quick_sql_analyzer = importlib.util.module_from_spec(_SPEC)
+_SPEC.loader.exec_module(quick_sql_analyzer)
+
+
+def search(pattern: str, text: str):
+    """Match a pattern the way the analyzer does, against a lowercased buffer."""
+    return quick_sql_analyzer._compile(pattern).search(text.encode().lower())
+
+
+class CompilePatternTests(unittest.TestCase):
+    def test_builtin_patterns_are_folded_without_ignorecase(self):
+        analyzer = quick_sql_analyzer.QuickSQLAnalyzer()
+        for patterns in (analyzer.sql_patterns, analyzer.ef_patterns, analyzer.ado_patterns):
+            for pattern in patterns.values():
+                self.assertFalse(quick_sql_analyzer._compile(pattern).flags & re.IGNORECASE, pattern)
+
+    def test_upper_case_escapes_keep_their_meaning(self):
+        self.assertTrue(search(r'Token=\S+', 'TOKEN=abc'))
+        self.assertFalse(search(r'Token=\S+', 'token= abc'))
+        self.assertTrue(search(r'\bSELECT\b', 'x = "Select 1"'))
+        self.assertFalse(search(r'\bSELECT\B', 'Select 1'))
+
+    def test_whitespace_in_class_does_not_cross_newlines(self):
+        self.assertTrue(search(r'SqlParameter[\s,]+Name', 'new SqlParameter, Name'))
+        self.assertFalse(search(r'SqlParameter[\s,]+Name', 'new SqlParameter\nName'))
+        self.assertFalse(search(r'CommandText\s*=', 'CommandText\n= x'))
+
+    def test_unfoldable_patterns_fall_back_to_ignorecase(self):
+        compiled = quick_sql_analyzer._compile(r'[A-Z]\w+Repository')
+        self.assertTrue(compiled.flags & re.IGNORECASE)
+        self.assertTrue(search(r'[A-Z]\w+Repository', 'class OrderRepository'))
+        self.assertTrue(search(r'\x53qlCommand', 'new SqlCommand()'))
+
+
+if __name__ == '__main__':
+    unittest.main()